@@ -11,7 +11,7 @@ T_src_out = 10.0 # Evaporator Temperature [degC]
 T_snk_in = 40.0 # Heat Sink Temperature [degC]
 T_snk_out = 90.0 # Condensation Temperature [degC]
 eta_comp = 0.85 # Compressor Efficiency [-]
-Q_src = 1000.0 * 1e3 # Evaporator Heat [W] 
+Q_src = 1000.0 * 1e3 # Evaporator Heat [W]
 Q_snk = -1012.0 * 1e3 # Condenser Heat [W]
 
 
@@ -24,275 +24,390 @@ pr_cd1 = 1.0  # Condenser Pressure Ratio 1 [-]
 pr_ev1 = 1.0 # Evaporator Pressure Ratio 1 [-]
 pr_cd2 = 1.0  # Condenser Pressure Ratio 2 [-]
 pr_ev2 = 1.0 # Evaporator Pressure Ratio 2 [-]
+ttd_u = 5.0 # Upper Terminal Temperature Difference [K]
 dt = 100 # Time Step [-]
 
+# Design Boundary Conditions
+bc_des = {"T_src_in": T_src_in, "p_src": p_amb, "T_snk_in": T_snk_in,
+          "T_snk_out": T_snk_out, "p_snk": p_sink, "Q_snk": Q_snk}
+
 #==============================================================================
 # Setup TESPy Model
 #==============================================================================
 
 # Imports
-from tespy.components import(Condenser, HeatExchanger, CycleCloser, 
-                             Compressor, Valve, Source, Sink)
-
-from tespy.connections import Connection, Ref
-from tespy.networks import Network
+import functools
+import importlib.metadata
+import inspect
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import matplotlib
+matplotlib.use("Agg") # Plots are Saved to File, no GUI Backend
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from numba import njit
 
-# Setup Network
+# Setup Network, Fluid Properties from CoolProp's HEOS Back End, the Tabular
+# (BICUBIC/TTSE) Back Ends do not Converge to the HEOS Design State
 wf = "Water" # Working Fluid
-nw = Network(p_unit="bar", T_unit="C", iterinfo=False) # Network
-
-# Build Components
-cp = Compressor("compressor")
-ev = HeatExchanger("evaporator")
-cd = Condenser("condenser")
-va = Valve("expansion valve")
-cc = CycleCloser("cycle closer")
-
-# Source and Sink
-so1 = Source("ambient air source")
-si1 = Sink("ambient air sink")
-so2 = Source("heating source")
-si2 = Sink("heating sink")
-
-# Build Connections
-c0 = Connection(va, "out1", cc, "in1", label="0")
-c1 = Connection(cc, "out1", ev, "in2", label="1")
-c2 = Connection(ev, "out2", cp, "in1", label="2")
-c3 = Connection(cp, "out1", cd, "in1", label="3")
-c4 = Connection(cd, "out1", va, "in1", label="4")
-
-# Source and Sink Connections
-c11 = Connection(so1, "out1", ev, "in1", label="11")
-c12 = Connection(ev, "out1", si1, "in1", label="12")
-
-c21 = Connection(so2, "out1", cd, "in2", label="21")
-c22 = Connection(cd, "out2", si2, "in1", label="22")
-
-# Add Connections to Network
-nw.add_conns(c0, c1, c2, c3, c4)
-nw.add_conns(c11, c12, c21, c22)
+src_fluid = "air" # Heat Source Fluid
+snk_fluid = "Water" # Heat Sink Fluid
+
+@functools.cache
+def build_network():
+    """Build the heat pump network, components are looked up by label.
+
+    The network is built once per process and reused by every solve in it.
+    TESPy is imported here rather than at module level, main() builds the
+    network before starting the worker pool so the forked workers inherit
+    TESPy instead of each importing it.
+    """
+    # Imports
+    from tespy.components import(Condenser, HeatExchanger, CycleCloser,
+                                 Compressor, Valve, Source, Sink)
+
+    from tespy.connections import Connection, Ref
+    from tespy.networks import Network
+
+    nw = Network(p_unit="bar", T_unit="C", iterinfo=False) # Network
+
+    # Build Components
+    cp = Compressor("compressor")
+    ev = HeatExchanger("evaporator")
+    cd = Condenser("condenser")
+    va = Valve("expansion valve")
+    cc = CycleCloser("cycle closer")
+
+    # Source and Sink
+    so1 = Source("ambient air source")
+    si1 = Sink("ambient air sink")
+    so2 = Source("heating source")
+    si2 = Sink("heating sink")
+
+    # Build Connections
+    c0 = Connection(va, "out1", cc, "in1", label="0")
+    c1 = Connection(cc, "out1", ev, "in2", label="1")
+    c2 = Connection(ev, "out2", cp, "in1", label="2")
+    c3 = Connection(cp, "out1", cd, "in1", label="3")
+    c4 = Connection(cd, "out1", va, "in1", label="4")
+
+    # Source and Sink Connections
+    c11 = Connection(so1, "out1", ev, "in1", label="11")
+    c12 = Connection(ev, "out1", si1, "in1", label="12")
+
+    c21 = Connection(so2, "out1", cd, "in2", label="21")
+    c22 = Connection(cd, "out2", si2, "in1", label="22")
+
+    # Add Connections to Network
+    nw.add_conns(c0, c1, c2, c3, c4)
+    nw.add_conns(c11, c12, c21, c22)
+
+    # Constant Specification Values
+    c2.set_attr(fluid={wf: 1}, x=x_g)
+    c11.set_attr(fluid={src_fluid: 1})
+    c12.set_attr(T=Ref(c11, 1, -2))
+    c21.set_attr(fluid={snk_fluid: 1})
+    cp.set_attr(eta_s=eta_comp)
+    cd.set_attr(pr1=pr_cd1, pr2=pr_cd2, ttd_u=ttd_u)
+    ev.set_attr(pr1=pr_ev1, pr2=pr_ev2, ttd_u=ttd_u)
+
+    return nw
+
+def set_boundary_conditions(nw, bc):
+    """Apply the boundary conditions in bc to the network.
+
+    The evaporator and condenser outlet states follow from x_g and ttd_u, so
+    only the source and sink connections and the heat load change per point.
+    The source outlet follows its inlet through the Ref set in build_network.
+    """
+    cd = nw.get_comp("condenser")
+    [c11, c21, c22] = [nw.get_conn(label) for label in ["11", "21", "22"]]
+
+    # Set Thermal Load
+    cd.set_attr(Q=bc["Q_snk"])
+
+    # Set Pressure and Temperature Values at the Inlets and Outlets
+    c11.set_attr(p=bc["p_src"], T=bc["T_src_in"])
+    c21.set_attr(p=bc["p_snk"], T=bc["T_snk_in"])
+    c22.set_attr(T=bc["T_snk_out"])
+
+def model_outputs(nw):
+    """Collect the model outputs of a solved network."""
+    cp = nw.get_comp("compressor")
+    ev = nw.get_comp("evaporator")
+    cd = nw.get_comp("condenser")
+
+    COP = abs(cd.Q.val) / cp.P.val # Coefficient of Performance [-]
+    P_comp = cp.P.val * 1e-3 # Compressor Power [kW]
+    Q_ev = abs(ev.Q.val) * 1e-3 # Evaporator Heat Transfer [kW]
+    Q_cd = abs(cd.Q.val) * 1e-3 # Condensor Heat Transfer [kW]
+
+    return COP, P_comp, Q_ev, Q_cd
+
+@njit(cache=True)
+def compute_metrics(Q_cd, P_cp, Q_ev):
+    """Compute the model outputs of a sweep from its raw results [W]."""
+    N = Q_cd.shape[0]
+    COP = np.empty(N) # Coefficient of Performance [-]
+    P_comp = np.empty(N) # Compressor Power [kW]
+    Q_ev_kW = np.empty(N) # Evaporator Heat Transfer [kW]
+    Q_cd_kW = np.empty(N) # Condensor Heat Transfer [kW]
+
+    for i in range(N):
+        COP[i] = abs(Q_cd[i]) / P_cp[i]
+        P_comp[i] = P_cp[i] * 1e-3
+        Q_ev_kW[i] = abs(Q_ev[i]) * 1e-3
+        Q_cd_kW[i] = abs(Q_cd[i]) * 1e-3
+
+    return COP, P_comp, Q_ev_kW, Q_cd_kW
 
 #==============================================================================
-# Design Conditon 
+# Design Conditon
 #==============================================================================
 
-# Set Optimal Operation at Specified Parameters 
-c2.set_attr(T=T_src_out)
-c4.set_attr(T=T_snk_out)
-cp.set_attr(eta_s=eta_comp)
-cd.set_attr(Q=Q_snk)
-
-# Set Fluid's State at the Evaporator's and Condenser's Outlet and Pressure 
-# Values at the Inlets
-c2.set_attr(fluid={wf: 1}, x=x_g)
-c11.set_attr(fluid={"air": 1}, p=p_amb, T=T_src_in)
-c12.set_attr(T=Ref(c11, 1, -2))
-c21.set_attr(fluid={"Water": 1}, p=p_sink, T=T_snk_in)
-c22.set_attr(T=T_snk_out)
-cd.set_attr(pr1=pr_cd1, pr2=pr_cd2)
-ev.set_attr(pr1=pr_ev1, pr2=pr_ev2)
-
-# Finalise Specification Values
-ev.set_attr(ttd_u=5)
-c2.set_attr(T=None)
-cd.set_attr(ttd_u=5)
-c4.set_attr(T=None)
-
-# Run Model
-nw.solve("design") # Solve Model
-nw.print_results() # Print Results
-nw.save("design-state") # Save Model with Design Conditions
-
-# Model Outputs
-COP = abs(cd.Q.val) / cp.P.val # Coefficient of Performance [-]
-P_comp = cp.P.val * 1e-3 # Compressor Power [kW]
-Q_ev = abs(ev.Q.val) * 1e-3 # Evaporator Heat Transfer [kW]
-Q_cd = abs(cd.Q.val) * 1e-3 # Condensor Heat Transfer [kW]
-
-Outputs_des = [COP, P_comp, Q_ev, Q_cd] # Collect Model Outputs
-print(Outputs_des)
+# Design States are Cached on Disk by their Inputs
+memory = joblib.Memory(".hpcache", verbose=0)
 
-#==============================================================================
-# Off-Design Conditon 
-#==============================================================================
+@memory.cache
+def _solve_design(bc, spec, path):
+    """Solve the design state and save it at path, spec keys the cache on the
+    constant design inputs."""
+    nw = build_network()
+    set_boundary_conditions(nw, bc)
 
-# Imports
-import numpy as np
-import matplotlib.pyplot as plt
+    # Run Model
+    nw.solve("design") # Solve Model
 
-# Influence of Heat Source Temperature
-T_range = np.linspace(T_src_in-5,
-                      T_src_in,11) # Heat Source Temperature Range [degC]
-COP = [] # Coefficient of Performance [-]
-P_comp = [] # Compressor Power [kW]
-Q_ev = [] # Evaporator Heat Transfer [kW]
-Q_cd = [] # Condensor Heat Transfer [kW]
-
-for i in T_range:
-    c11.set_attr(T=i) # Set Heat Source Temperature Range [degC]
-    nw.solve("offdesign", design_path="design-state") # Solve Model
-    
-    COP= np.append(COP,(abs(cd.Q.val) / cp.P.val)) # Coefficient of Performance [-]
-    P_comp = np.append(P_comp,cp.P.val * 1e-3) # Compressor Power [kW]
-    Q_ev = np.append(Q_ev,ev.Q.val * 1e-3) # Evaporator Heat Transfer [kW]
-    Q_cd = np.append(Q_cd,cd.Q.val * 1e-3) # Condensor Heat Transfer [kW]
-
-# Plots of Outputs against Ambient Temperature
-fig, ax = plt.subplots(4)
-
-ax[0].plot(T_range,COP)
-ax[1].plot(T_range,P_comp)
-ax[2].plot(T_range,abs(Q_ev))
-ax[3].plot(T_range,abs(Q_cd))
-
-ax[0].set_ylabel("COP [-]")
-ax[1].set_ylabel("Compressor Power [W]")
-ax[2].set_ylabel("Evaporator Heat Transfer [W]")
-ax[3].set_ylabel("Condenser Heat Transfer [W]")
-
-ax[3].set_xlabel("Ambient Air Temperature [degC]")
-
-ax[0].grid()
-ax[1].grid()
-ax[2].grid()
-ax[3].grid()
-
-# plt.close()
-
-# Influence of Thermal Load
-Q_range = np.linspace(1e-3,1.0,11) * Q_snk # Heat Range [W]
-COP = [] # Coefficient of Performance [-]
-P_comp = [] # Compressor Power [kW]
-Q_ev = [] # Evaporator Heat Transfer [kW]
-Q_cd = [] # Condensor Heat Transfer [kW]
-
-for i in Q_range:
-    cd.set_attr(Q=i) # Reduced Thermal Load [W]
-    nw.solve("offdesign", design_path="design-state") # Solve Model
-    
-    COP= np.append(COP,(abs(cd.Q.val) / cp.P.val)) # Coefficient of Performance [-]
-    P_comp = np.append(P_comp,cp.P.val * 1e-3) # Compressor Power [kW]
-    Q_ev = np.append(Q_ev,ev.Q.val * 1e-3) # Evaporator Heat Transfer [kW]
-    Q_cd = np.append(Q_cd,cd.Q.val * 1e-3) # Condensor Heat Transfer [kW]
-
-# Plot Reuced Thermal Load
-fig, ax = plt.subplots(4)
-
-ax[0].plot(np.abs(Q_range),COP)
-ax[1].plot(np.abs(Q_range),P_comp)
-ax[2].plot(np.abs(Q_range),abs(Q_ev))
-ax[3].plot(np.abs(Q_range),abs(Q_cd))
-
-ax[0].set_ylabel("COP [-]")
-ax[1].set_ylabel("Compressor Power [W]")
-ax[2].set_ylabel("Evaporator Heat Transfer [W]")
-ax[3].set_ylabel("Condenser Heat Transfer [W]")
-
-ax[3].set_xlabel("Heat Production [W]")
-
-ax[0].grid()
-ax[1].grid()
-ax[2].grid()
-ax[3].grid()
-
-# plt.close()
+    # A Failed Design is Raised, not Cached
+    if not nw.converged:
+        raise RuntimeError("Design state " + os.path.basename(path) +
+                           " did not converge.")
+
+    nw.print_results() # Print Results
+    nw.save(path) # Save Model with Design Conditions
+
+    return list(model_outputs(nw)) # Collect Model Outputs
+
+def solve_design(bc, name):
+    """Solve the design state for the boundary conditions in bc.
+
+    Returns the model outputs and the path of the saved design state. When the
+    inputs, the model functions and the TESPy version are unchanged the solve
+    is skipped and the cached state is reused.
+    """
+    bc = {j: float(bc[j]) for j in bc}
+    spec = {"wf": wf, "src_fluid": src_fluid, "snk_fluid": snk_fluid,
+            "x_g": x_g, "eta_comp": eta_comp, "ttd_u": ttd_u,
+            "pr_cd1": pr_cd1, "pr_cd2": pr_cd2, "pr_ev1": pr_ev1, "pr_ev2": pr_ev2,
+            "tespy": importlib.metadata.version("tespy"),
+            "model": joblib.hash([inspect.getsource(j) for j in
+                                  [build_network, set_boundary_conditions,
+                                   model_outputs]])}
+    path = os.path.join(memory.location, name + "-" + joblib.hash((bc, spec)))
+
+    # Cached Outputs without their Saved State are Recomputed for this Key only,
+    # check_call_in_cache also Records the Function Code before the Forced Call
+    if not os.path.exists(path) and _solve_design.check_call_in_cache(bc, spec, path):
+        [outputs, _] = _solve_design.call(bc, spec, path)
+        return outputs, path
+
+    return _solve_design(bc, spec, path), path
 
 #==============================================================================
-# Dataset
+# Off-Design Conditon
 #==============================================================================
 
-# Imports
-import pandas as pd
+def solve_chunk(params):
+    """Solve a contiguous run of sweep points by continuation, params = (bcs, path).
 
-# Read Excel File and Extract Data
-file_name = [r"C:\Users\sakar\Downloads\Work\HeatPumpModel\HP_case_data.xlsx"]
-src_data = pd.read_excel(file_name[0],engine="openpyxl",sheet_name="Heat source")
-snk_data = pd.read_excel(file_name[0],engine="openpyxl",sheet_name="Heat sink")
-
-# Heat Source Data 
-[temp_in_src,temp_out_src,p_src,m_src] = [src_data["T_in[degC"].tolist(),
-                                          src_data["T_out[degC]"].tolist(),
-                                          src_data["P[bar]"].tolist(),
-                                          src_data["flow[kg/s]"].tolist()]
-
-# Heat Sink Data
-[temp_in_snk,temp_out_snk,p_snk,e_snk] = [snk_data["T_in[degC"].tolist(),
-                                          snk_data["T_out[degC]"].tolist(),
-                                          snk_data["P[bar]"].tolist(),
-                                          snk_data["Energy[kWh]"].tolist()]
-
-COP = [] # Coefficient of Performance [-]
-P_comp = [] # Compressor Power [kW]
-Q_ev = [] # Evaporator Heat Transfer [kW]
-Q_cd = [] # Condensor Heat Transfer [kW]
-
-time = np.linspace(1,len(temp_in_src)+1,dt) # Measurement time [hr]
-
-for i in np.linspace(0,len(temp_in_src)-1,dt).astype(int):
-    # Set Optimal Operation at Specified Parameters 
-    c2.set_attr(T=temp_out_src[i])
-    c4.set_attr(T=temp_out_snk[i])
-    cp.set_attr(eta_s=eta_comp)
-    cd.set_attr(Q=-e_snk[i]*1e3)
-    
-    # Set Fluid's State at the Evaporator's and Condenser's Outlet and Pressure
-    # Values at the Inlets
-    c2.set_attr(fluid={wf: 1}, x=x_g)
-    c11.set_attr(fluid={"air": 1}, p=p_src[i], T=temp_in_src[i])
-    c12.set_attr(T=Ref(c11, 1, -2))
-    c21.set_attr(fluid={"Water": 1}, p=p_snk[i], T=temp_in_snk[i])
-    c22.set_attr(T=temp_out_snk[i])
-    cd.set_attr(pr1=pr_cd1, pr2=pr_cd2)
-    ev.set_attr(pr1=pr_ev1, pr2=pr_ev2)
-    
-    # Finalise Specification Values
-    ev.set_attr(ttd_u=5)
-    c2.set_attr(T=None)
-    cd.set_attr(ttd_u=5)
-    c4.set_attr(T=None)
-    
-    # Run Model
-    nw.solve("design") # Solve Model
-    
-    # Model Outputs
-    COP= np.append(COP,(abs(cd.Q.val) / cp.P.val)) # Coefficient of Performance [-]
-    P_comp = np.append(P_comp,cp.P.val * 1e-3) # Compressor Power [kW]
-    Q_ev = np.append(Q_ev,abs(ev.Q.val) * 1e-3) # Evaporator Heat Transfer [kW]
-    Q_cd = np.append(Q_cd,abs(cd.Q.val) * 1e-3) # Condensor Heat Transfer [kW]
+    All points are solved offdesign against the design state saved at path in
+    one network. The first point is initialised from the design state, every
+    following point from the previous solution the network still holds.
+    """
+    [bcs, path] = params
+
+    nw = build_network() # Each Worker Holds its Own Network
+    out = []
+    init_path = path
+
+    for bc in bcs:
+        set_boundary_conditions(nw, bc)
+        nw.solve("offdesign", design_path=path, init_path=init_path) # Solve Model
+
+        # A Failed Point does not Initialise the Next, it Restarts from Design
+        init_path = None if nw.converged else path
+
+        # Raw Results [W]
+        out.append((nw.get_comp("condenser").Q.val,
+                    nw.get_comp("compressor").P.val,
+                    nw.get_comp("evaporator").Q.val))
+
+    return out
+
+def split_sweep(bcs, path, n):
+    """Split a sweep into n contiguous chunks for solve_chunk."""
+    return [([bcs[j] for j in k], path)
+            for k in np.array_split(np.arange(len(bcs)), min(n, len(bcs)))]
+
+def submit_sweep(executor, bcs, path, n_chunks):
+    """Submit a sweep to executor in n_chunks chunks, solved offdesign against
+    the design state at path, returns the futures of the chunks in order."""
+    # Contiguous Chunks of Neighbouring Points are Solved by Continuation
+    return [executor.submit(solve_chunk, j)
+            for j in split_sweep(bcs, path, n_chunks)]
+
+def collect_sweep(futures):
+    """Wait for the chunks of a sweep and compute its model outputs."""
+    out = [j for chunk in futures for j in chunk.result()]
 
+    Q_cd_raw = np.empty(len(out)) # Condensor Heat Transfer [W]
+    P_cp_raw = np.empty(len(out)) # Compressor Power [W]
+    Q_ev_raw = np.empty(len(out)) # Evaporator Heat Transfer [W]
 
-# Plot Reuced Thermal Load
-fig, ax = plt.subplots(4)
+    for i, j in enumerate(out):
+        [Q_cd_raw[i], P_cp_raw[i], Q_ev_raw[i]] = j
 
-ax[0].plot(time,COP)
-ax[1].plot(time,P_comp)
-ax[2].plot(time,abs(Q_ev))
-ax[3].plot(time,abs(Q_cd))
+    return compute_metrics(Q_cd_raw, P_cp_raw, Q_ev_raw)
 
-ax[0].set_ylabel("COP [-]")
-ax[1].set_ylabel("Compressor Power [W]")
-ax[2].set_ylabel("Evaporator Heat Transfer [W]")
-ax[3].set_ylabel("Condenser Heat Transfer [W]")
+def temperature_sweep(T_range):
+    """Boundary conditions for the influence of the heat source temperature
+    [degC]."""
+    return [dict(bc_des, T_src_in=i) for i in T_range]
 
-ax[3].set_xlabel("Measurement Time [hr]")
+def load_sweep(Q_range):
+    """Boundary conditions for the influence of the thermal load [W]."""
+    return [dict(bc_des, Q_snk=i) for i in Q_range]
 
-ax[0].grid()
-ax[1].grid()
-ax[2].grid()
-ax[3].grid()
+#==============================================================================
+# Dataset
+#==============================================================================
+
+def load_dataset(file_name):
+    """Read the heat source and sink sheets, cached as Parquet next to the
+    workbook under names derived from it."""
+    base = os.path.splitext(os.path.abspath(file_name))[0]
+    cache_name = {"Heat source": base + "-source.parquet",
+                  "Heat sink": base + "-sink.parquet"} # Parquet Cache of Sheets
+
+    # Use the Parquet Cache unless the Excel File is Newer
+    if all(os.path.isfile(j) and (not os.path.isfile(file_name) or
+                                  os.path.getmtime(j) >= os.path.getmtime(file_name))
+           for j in cache_name.values()):
+        data = {i: pd.read_parquet(j) for i, j in cache_name.items()}
+    else:
+        data = pd.read_excel(file_name,engine="openpyxl",sheet_name=None) # All Sheets
+        for i, j in cache_name.items():
+            data[i].to_parquet(j)
+
+    return data["Heat source"], data["Heat sink"]
+
+def dataset_sweep(file_name):
+    """Sample dt rows of the dataset and solve their design state, returns
+    time [hr], the boundary conditions of the rows and the design path."""
+    [src_data, snk_data] = load_dataset(file_name)
+
+    # Heat Source Data
+    [temp_in_src,p_src,m_src] = [src_data[j].to_numpy(np.float64, copy=False)
+                                 for j in ["T_in[degC", "P[bar]", "flow[kg/s]"]]
+
+    # Heat Sink Data
+    [temp_in_snk,temp_out_snk,p_snk,e_snk] = [snk_data[j].to_numpy(np.float64, copy=False)
+                                              for j in ["T_in[degC", "T_out[degC]",
+                                                        "P[bar]", "Energy[kWh]"]]
+
+    # Sampled Rows, Duplicates would Repeat Identical Solves
+    idx = np.unique(np.linspace(0,len(temp_in_src)-1,dt,dtype=int))
+    time = idx + 1 # Measurement time [hr]
+
+    # Boundary Conditions of the Sampled Rows
+    bc_rows = {"T_src_in": temp_in_src[idx],
+               "p_src": p_src[idx],
+               "T_snk_in": temp_in_snk[idx],
+               "T_snk_out": temp_out_snk[idx],
+               "p_snk": p_snk[idx],
+               "Q_snk": -e_snk[idx]*1e3}
+
+    # Unboxed to Python Floats only for TESPy's set_attr
+    bc_data = [{j: float(bc_rows[j][i]) for j in bc_rows}
+               for i in range(len(idx))]
+
+    # Design the Heat Pump once at Representative (Mean) Dataset Conditions
+    [_, path] = solve_design({j: bc_rows[j].mean() for j in bc_rows},
+                             "dataset-design")
+
+    # Consecutive Rows are Solved by Continuation like the Sweeps
+    return time, bc_data, path
+
+#==============================================================================
+# Plots
+#==============================================================================
+
+def plot_sweep(ax, x, COP, P_comp, Q_ev, Q_cd, xlabel):
+    """Plot the model outputs of a sweep into one column of axes, the heat
+    transfer rates are already absolute from compute_metrics."""
+    ax[0].plot(x,COP)
+    ax[1].plot(x,P_comp)
+    ax[2].plot(x,Q_ev)
+    ax[3].plot(x,Q_cd)
 
-# plt.close()
+    ax[3].set_xlabel(xlabel)
 
+    for i in ax:
+        i.grid()
 
+#==============================================================================
+# Main
+#==============================================================================
 
+def main():
+    """Run the design, off-design and dataset simulations and plot them."""
+    # Design Condition
+    [Outputs_des, design_path] = solve_design(bc_des, "design-state")
+    print(Outputs_des)
 
+    # One Figure, One Column of Axes per Sweep
+    fig, ax = plt.subplots(4, 3, figsize=(15, 10), layout="constrained")
 
+    ax[0, 0].set_ylabel("COP [-]")
+    ax[1, 0].set_ylabel("Compressor Power [W]")
+    ax[2, 0].set_ylabel("Evaporator Heat Transfer [W]")
+    ax[3, 0].set_ylabel("Condenser Heat Transfer [W]")
 
+    # Influence of Heat Source Temperature and Thermal Load
+    T_range = np.sort(np.linspace(T_src_in-5,
+                                  T_src_in,11)) # Heat Source Temperature Range [degC]
+    Q_range = np.linspace(1e-3,1.0,11) * Q_snk # Heat Range [W]
 
+    # Dataset
+    file_name = [r"C:\Users\sakar\Downloads\Work\HeatPumpModel\HP_case_data.xlsx"]
 
+    [time, bc_data, data_path] = dataset_sweep(file_name[0])
 
+    # The Three Sweeps are Independent and Run Concurrently, the Chunks of all
+    # of them Share one Pool of Worker Processes Created in the Main Thread
+    n_workers = os.cpu_count() or 1 # Worker Processes
+    build_network() # Inherited by the Forked Workers, even on a Design Cache Hit
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = [submit_sweep(executor, bcs, path, n_workers)
+                   for [bcs, path] in [(temperature_sweep(T_range), design_path),
+                                       (load_sweep(Q_range), design_path),
+                                       (bc_data, data_path)]]
+        [out_T, out_Q, out_data] = [collect_sweep(j) for j in futures]
 
+    # Plots of Outputs against Ambient Temperature
+    plot_sweep(ax[:, 0], T_range, *out_T, "Ambient Air Temperature [degC]")
 
+    # Plot Reuced Thermal Load
+    plot_sweep(ax[:, 1], np.abs(Q_range), *out_Q, "Heat Production [W]")
 
+    # Plots of Outputs against Measurement Time
+    plot_sweep(ax[:, 2], time, *out_data, "Measurement Time [hr]")
 
+    fig.savefig("sweeps.png", dpi=100) # Save Plots
+    plt.close(fig)
 
+if __name__ == "__main__":
+    main()